@@ -6,13 +6,29 @@ from datetime import datetime, timedelta, timezone
 from bot.utils.utils import Utils, is_superuser
 from bot.utils.logger import log_moderation_action
 
+# Case status labels shared by /case, /history and /recent
+STATUS_ACTIVE = "🟢 Active"
+STATUS_INACTIVE = "🔴 Inactive"
+DOT_ACTIVE = "🟢"
+DOT_INACTIVE = "🔴"
+
+# Permission bitmasks resolved once at import
+MODERATE_MEMBERS_MASK = discord.Permissions(moderate_members=True).value
+BAN_MEMBERS_MASK = discord.Permissions(ban_members=True).value
+KICK_MEMBERS_MASK = discord.Permissions(kick_members=True).value
+MANAGE_MESSAGES_MASK = discord.Permissions(manage_messages=True).value
+
 
 class Moderation(commands.Cog):
     """Moderation commands for the bot"""
     
     def __init__(self, bot):
         self.bot = bot
-    
+
+    def resolve_users(self, user_ids) -> dict:
+        """Resolve a set of user IDs to cached user objects, or None for users not in the cache"""
+        return {user_id: self.bot.get_user(user_id) for user_id in user_ids}
+
     @app_commands.command(name="ban", description="Ban a user from the server")
     @app_commands.describe(
         user="The user to ban",
@@ -33,9 +49,7 @@ class Moderation(commands.Cog):
         duration_seconds = None
         
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["ban_members"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["ban_members"]):
+            if not await Utils.check_all_permissions(interaction, BAN_MEMBERS_MASK, BAN_MEMBERS_MASK):
                 return
             
             # Check hierarchy
@@ -153,9 +167,7 @@ class Moderation(commands.Cog):
     ):
         """Kick a user from the server"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["kick_members"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["kick_members"]):
+            if not await Utils.check_all_permissions(interaction, KICK_MEMBERS_MASK, KICK_MEMBERS_MASK):
                 return
             
             # Check hierarchy
@@ -235,9 +247,7 @@ class Moderation(commands.Cog):
     ):
         """Timeout a user"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["moderate_members"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["moderate_members"]):
+            if not await Utils.check_all_permissions(interaction, MODERATE_MEMBERS_MASK, MODERATE_MEMBERS_MASK):
                 return
             
             # Parse duration
@@ -323,9 +333,7 @@ class Moderation(commands.Cog):
     ):
         """Remove timeout from a user"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["moderate_members"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["moderate_members"]):
+            if not await Utils.check_all_permissions(interaction, MODERATE_MEMBERS_MASK, MODERATE_MEMBERS_MASK):
                 return
             
             # Check if user is timed out
@@ -374,7 +382,7 @@ class Moderation(commands.Cog):
     ):
         """Warn a user"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["kick_members"]):
+            if not await Utils.check_permission_mask(interaction, KICK_MEMBERS_MASK):
                 return
         
         try:
@@ -453,7 +461,7 @@ class Moderation(commands.Cog):
     ):
         """View warnings for a user"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["kick_members"]):
+            if not await Utils.check_permission_mask(interaction, KICK_MEMBERS_MASK):
                 return
         
         try:
@@ -526,9 +534,7 @@ class Moderation(commands.Cog):
     ):
         """Delete multiple messages"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_messages"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["manage_messages"]):
+            if not await Utils.check_all_permissions(interaction, MANAGE_MESSAGES_MASK, MANAGE_MESSAGES_MASK):
                 return
             
             # Validate amount
@@ -590,7 +596,7 @@ class Moderation(commands.Cog):
     ):
         """Clear all warnings for a user"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["kick_members"]):
+            if not await Utils.check_permission_mask(interaction, KICK_MEMBERS_MASK):
                 return
         
         try:
@@ -666,7 +672,7 @@ class Moderation(commands.Cog):
     ):
         """Remove a specific warning by ID"""
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["kick_members"]):
+            if not await Utils.check_permission_mask(interaction, KICK_MEMBERS_MASK):
                 return
         
         try:
@@ -742,7 +748,7 @@ class Moderation(commands.Cog):
             pass  # allow
         else:
             # Check permissions
-            if not await Utils.check_permissions(interaction, ["moderate_members"]):
+            if not await Utils.check_permission_mask(interaction, MODERATE_MEMBERS_MASK):
                 return
         
         try:
@@ -782,7 +788,7 @@ class Moderation(commands.Cog):
                 )
             
             # Add status
-            status = "🟢 Active" if case['active'] else "🔴 Inactive"
+            status = STATUS_ACTIVE if case['active'] else STATUS_INACTIVE
             embed.add_field(name="Status", value=status, inline=True)
             
             if user:
@@ -814,7 +820,7 @@ class Moderation(commands.Cog):
             pass  # allow
         else:
             # Check permissions
-            if not await Utils.check_permissions(interaction, ["moderate_members"]):
+            if not await Utils.check_permission_mask(interaction, MODERATE_MEMBERS_MASK):
                 return
         
         # Validate limit
@@ -827,9 +833,10 @@ class Moderation(commands.Cog):
             return
         
         try:
-            cases = await self.bot.database.get_user_cases(interaction.guild.id, user.id)
+            all_cases = await self.bot.database.get_user_cases(interaction.guild.id, user.id)
+            total_cases = len(all_cases)
             
-            if not cases:
+            if not all_cases:
                 await Utils.send_response(
                     interaction,
                     embed=Utils.create_embed(
@@ -840,40 +847,45 @@ class Moderation(commands.Cog):
                 )
                 return
             
-            # Limit the results
-            cases = cases[:limit]
+            # Limit the results (quiet users usually fit without slicing)
+            cases = all_cases if total_cases <= limit else all_cases[:limit]
             
             embed = Utils.create_embed(
                 title=f"📋 Moderation History - {user.display_name}",
-                description=f"Showing {len(cases)} of {len(await self.bot.database.get_user_cases(interaction.guild.id, user.id))} total cases",
+                description=f"Showing {len(cases)} of {total_cases} total cases",
                 color=discord.Color.blue(),
                 thumbnail=user.display_avatar.url
             )
             
+            # Resolve all moderators up front instead of once per case
+            users = self.resolve_users({c['moderator_id'] for c in cases})
+
             # Add case information
             for case in cases:
-                moderator = self.bot.get_user(case['moderator_id'])
+                moderator = users[case['moderator_id']]
                 moderator_name = moderator.name if moderator else "Unknown"
                 
-                status = "🟢" if case['active'] else "🔴"
-                case_info = f"{status} **{case['case_type'].title()}** by {moderator_name}"
-                case_info += f"\n**Reason:** {case['reason'] or 'No reason provided'}"
-                case_info += f"\n**Date:** {Utils.format_timestamp(datetime.fromisoformat(case['created_at']))}"
+                status = DOT_ACTIVE if case['active'] else DOT_INACTIVE
+                case_lines = [
+                    f"{status} **{case['case_type'].title()}** by {moderator_name}",
+                    f"**Reason:** {case['reason'] or 'No reason provided'}",
+                    f"**Date:** {Utils.format_timestamp(case['created_ts'])}"
+                ]
                 
                 if case['duration']:
-                    case_info += f"\n**Duration:** {Utils.format_duration(case['duration'])}"
+                    case_lines.append(f"**Duration:** {Utils.format_duration(case['duration'])}")
                 
                 embed.add_field(
                     name=f"Case #{case['id']}",
-                    value=case_info,
+                    value="\n".join(case_lines),
                     inline=False
                 )
             
             # Add summary at the bottom
-            active_cases = [c for c in await self.bot.database.get_user_cases(interaction.guild.id, user.id) if c['active']]
+            active_count = sum(1 for c in all_cases if c['active'])
             embed.add_field(
                 name="Summary",
-                value=f"**Total Cases:** {len(await self.bot.database.get_user_cases(interaction.guild.id, user.id))}\n**Active Cases:** {len(active_cases)}",
+                value=f"**Total Cases:** {total_cases}\n**Active Cases:** {active_count}",
                 inline=False
             )
             
@@ -895,7 +907,7 @@ class Moderation(commands.Cog):
             pass  # allow
         else:
             # Check permissions
-            if not await Utils.check_permissions(interaction, ["moderate_members"]):
+            if not await Utils.check_permission_mask(interaction, MODERATE_MEMBERS_MASK):
                 return
         
         # Validate limit
@@ -909,15 +921,7 @@ class Moderation(commands.Cog):
         
         try:
             # Get recent cases from database
-            async with self.bot.database.connection.execute(
-                """SELECT * FROM moderation_cases 
-                   WHERE guild_id = ? 
-                   ORDER BY created_at DESC 
-                   LIMIT ?""",
-                (interaction.guild.id, limit)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                cases = [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
+            cases = await self.bot.database.get_recent_cases(interaction.guild.id, limit)
             
             if not cases:
                 await Utils.send_response(
@@ -936,26 +940,34 @@ class Moderation(commands.Cog):
                 color=discord.Color.blue()
             )
             
+            # Resolve all users and moderators up front instead of once per case
+            users = self.resolve_users(
+                {c['user_id'] for c in cases} | {c['moderator_id'] for c in cases}
+            )
+
             # Add case information
+            add_field = embed.add_field
             for case in cases:
-                user = self.bot.get_user(case['user_id'])
-                moderator = self.bot.get_user(case['moderator_id'])
+                user = users[case['user_id']]
+                moderator = users[case['moderator_id']]
                 
                 user_name = user.name if user else f"Unknown User ({case['user_id']})"
                 moderator_name = moderator.name if moderator else f"Unknown Moderator ({case['moderator_id']})"
                 
-                status = "🟢" if case['active'] else "🔴"
-                case_info = f"{status} **{case['case_type'].title()}** on {user_name}"
-                case_info += f"\n**Moderator:** {moderator_name}"
-                case_info += f"\n**Reason:** {case['reason'] or 'No reason provided'}"
-                case_info += f"\n**Date:** {Utils.format_timestamp(datetime.fromisoformat(case['created_at']))}"
+                status = DOT_ACTIVE if case['active'] else DOT_INACTIVE
+                case_lines = [
+                    f"{status} **{case['case_type'].title()}** on {user_name}",
+                    f"**Moderator:** {moderator_name}",
+                    f"**Reason:** {case['reason'] or 'No reason provided'}",
+                    f"**Date:** {Utils.format_timestamp(case['created_ts'])}"
+                ]
                 
                 if case['duration']:
-                    case_info += f"\n**Duration:** {Utils.format_duration(case['duration'])}"
+                    case_lines.append(f"**Duration:** {Utils.format_duration(case['duration'])}")
                 
-                embed.add_field(
+                add_field(
                     name=f"Case #{case['id']}",
-                    value=case_info,
+                    value="\n".join(case_lines),
                     inline=False
                 )
             
@@ -1,39 +1,160 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from datetime import timedelta
+from datetime import datetime, timedelta
+import asyncio
 import json
 import os
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from bot.utils.utils import Utils, is_superuser
 
 NSFW_RESPONSIBLES_PATH = os.path.join(os.path.dirname(__file__), '..', 'nsfw_responsibles.json')
 
-def set_responsible(category_id: int, user_id: int, category_name: str = None):
-    try:
-        with open(NSFW_RESPONSIBLES_PATH, 'r') as f:
-            data = json.load(f)
-    except Exception:
-        data = {}
+# Name suffixes tying an NSFW category to its access role
+NSFW_SUFFIX = " NSFW"
+GOONER_SUFFIX = " Gooner"
+
+# Permission bitmask required from both users and the bot for the NSFW management commands
+MANAGE_CHANNELS_ROLES_MASK = discord.Permissions(manage_channels=True, manage_roles=True).value
+
+# Permission overwrites used by setup_nsfw; these never change, so build them once
+NSFW_EVERYONE_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=False,
+    send_messages=False
+)
+NSFW_ROLE_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=True,
+    send_messages=True,
+    read_messages=True,
+    read_message_history=True,
+    attach_files=True,
+    embed_links=True,
+    add_reactions=True,
+    use_external_emojis=True
+)
+NSFW_BOT_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=True,
+    send_messages=True,
+    manage_messages=True,
+    read_messages=True,
+    read_message_history=True
+)
+NSFW_MODERATOR_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=True,
+    send_messages=True,
+    read_messages=True,
+    read_message_history=True,
+    manage_messages=True,
+    attach_files=True,
+    embed_links=True,
+    add_reactions=True,
+    use_external_emojis=True,
+    manage_threads=True
+)
+
+# Channels created inside every NSFW category
+NSFW_CHANNELS: tuple[tuple[str, str], ...] = (
+    ("dm-requests", "Request DMs and private content"),
+    ("pics", "Share and discuss pictures"),
+    ("vids", "Share and discuss videos"),
+    ("nsfw-chat", "General NSFW discussion"),
+    ("ai-content", "AI-generated NSFW content"),
+    ("tributes", "Tribute content and requests")
+)
+
+# Caps concurrent Discord REST calls so batched requests stay inside rate limits
+DISCORD_SEMAPHORE = asyncio.Semaphore(5)
+
+async def bounded(coro):
+    """Await a Discord API call while holding the shared request semaphore"""
+    async with DISCORD_SEMAPHORE:
+        return await coro
+
+def index_by_name(items) -> dict:
+    """Map names to objects, keeping the first match like discord.utils.get"""
+    index = {}
+    for item in items:
+        index.setdefault(item.name, item)
+    return index
+
+def last_activity(channel) -> datetime:
+    """Get the time of the most recent message in a channel, or its creation time if it is empty"""
+    # The gateway keeps last_message_id current, and its snowflake encodes the send time;
+    # Discord reports no last_message_id only for channels that never had a message
+    if channel.last_message_id:
+        return discord.utils.snowflake_time(channel.last_message_id)
+    return channel.created_at
+
+# Name indexes of guild roles and categories, reused between commands until they expire
+GUILD_INDEX_TTL = 5
+guild_indexes: dict[int, tuple[float, dict, dict]] = {}
+
+def get_guild_index(guild: discord.Guild) -> tuple[dict, dict]:
+    """Get name indexes of a guild's roles and categories, rebuilding them once expired"""
+    now = time.monotonic()
+    cached = guild_indexes.get(guild.id)
+    if cached and now - cached[0] < GUILD_INDEX_TTL:
+        return cached[1], cached[2]
+    roles_by_name = index_by_name(guild.roles)
+    categories_by_name = index_by_name(guild.categories)
+    guild_indexes[guild.id] = (now, roles_by_name, categories_by_name)
+    return roles_by_name, categories_by_name
+
+# Parsed contents of the responsibles file, loaded on first use
+responsibles_cache = None
+# Serializes file writes so a newer snapshot is never overwritten by an older one
+responsibles_write_lock = asyncio.Lock()
+
+def load_responsibles() -> dict:
+    """Get the responsibles mapping, reading the JSON file only the first time"""
+    global responsibles_cache
+    if responsibles_cache is None:
+        responsibles_cache = {}
+        if os.path.exists(NSFW_RESPONSIBLES_PATH):
+            try:
+                with open(NSFW_RESPONSIBLES_PATH, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson else json.loads(raw)
+            except (OSError, ValueError):
+                data = None  # Unreadable or corrupt file; start over and let the next write replace it
+            if isinstance(data, dict):
+                responsibles_cache = data
+    return responsibles_cache
+
+def write_responsibles(payload: bytes):
+    """Write encoded responsibles to a temporary file and swap it in so readers never see a partial file"""
+    tmp_path = NSFW_RESPONSIBLES_PATH + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, NSFW_RESPONSIBLES_PATH)
+
+async def set_responsible(category_id: int, user_id: int, category_name: str = None):
+    data = load_responsibles()
     entry = {"user_id": user_id}
     if category_name:
         entry["category_name"] = category_name
     data[str(category_id)] = entry
-    with open(NSFW_RESPONSIBLES_PATH, 'w') as f:
-        json.dump(data, f)
+    async with responsibles_write_lock:
+        # Encode on the event loop so the snapshot is consistent, then do the disk I/O off it
+        if orjson:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data, separators=(",", ":")).encode()
+        await asyncio.to_thread(write_responsibles, payload)
 
 def get_responsible(category_id: int):
-    try:
-        with open(NSFW_RESPONSIBLES_PATH, 'r') as f:
-            data = json.load(f)
-        entry = data.get(str(category_id))
-        if isinstance(entry, dict):
-            return entry.get("user_id"), entry.get("category_name")
-        elif isinstance(entry, int):  # legacy
-            return entry, None
-        return None, None
-    except Exception:
-        return None, None
+    entry = load_responsibles().get(str(category_id))
+    if isinstance(entry, dict):
+        return entry.get("user_id"), entry.get("category_name")
+    elif isinstance(entry, int):  # legacy
+        return entry, None
+    return None, None
 
 class NSFWManagement(commands.Cog):
     """NSFW content management functionality"""
@@ -55,9 +176,7 @@ class NSFWManagement(commands.Cog):
         """Set up NSFW category with channels, role, and responsible user"""
         # Superuser bypass
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_channels", "manage_roles"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["manage_channels", "manage_roles"]):
+            if not await Utils.check_all_permissions(interaction, MANAGE_CHANNELS_ROLES_MASK, MANAGE_CHANNELS_ROLES_MASK):
                 return
 
         # Validate name length
@@ -73,88 +192,70 @@ class NSFWManagement(commands.Cog):
         await interaction.response.defer()
 
         try:
+            actor = str(interaction.user)
+            reason = f"NSFW setup by {actor}"
+
             # Create role first
-            role_name = f"{name} Gooner"
+            role_name = f"{name}{GOONER_SUFFIX}"
             role = await interaction.guild.create_role(
                 name=role_name,
                 mentionable=False,
-                reason=f"NSFW setup by {interaction.user}"
+                reason=reason
             )
 
             # Create category
-            category_name = f"{name} NSFW"
-              # Set up permissions for the category
+            category_name = f"{name}{NSFW_SUFFIX}"
+            # Set up permissions for the category
             overwrites = {
-                interaction.guild.default_role: discord.PermissionOverwrite(
-                    view_channel=False,
-                    send_messages=False
-                ),
-                role: discord.PermissionOverwrite(
-                    view_channel=True,
-                    send_messages=True,
-                    read_messages=True,
-                    read_message_history=True,
-                    attach_files=True,
-                    embed_links=True,
-                    add_reactions=True,
-                    use_external_emojis=True
-                ),
-                interaction.guild.me: discord.PermissionOverwrite(
-                    view_channel=True,
-                    send_messages=True,
-                    manage_messages=True,
-                    read_messages=True,
-                    read_message_history=True
-                )
+                interaction.guild.default_role: NSFW_EVERYONE_OVERWRITE,
+                role: NSFW_ROLE_OVERWRITE,
+                interaction.guild.me: NSFW_BOT_OVERWRITE
             }
 
             # Add Moderator role permissions if it exists
-            moderator_role = discord.utils.get(interaction.guild.roles, name="Moderator")
+            roles_by_name, _ = get_guild_index(interaction.guild)
+            moderator_role = roles_by_name.get("Moderator")
             if moderator_role:
-                overwrites[moderator_role] = discord.PermissionOverwrite(
-                    view_channel=True,
-                    send_messages=True,
-                    read_messages=True,
-                    read_message_history=True,
-                    manage_messages=True,
-                    attach_files=True,
-                    embed_links=True,
-                    add_reactions=True,
-                    use_external_emojis=True,
-                    manage_threads=True
-                )
+                overwrites[moderator_role] = NSFW_MODERATOR_OVERWRITE
 
             category = await interaction.guild.create_category(
                 name=category_name,
                 overwrites=overwrites,
-                reason=f"NSFW setup by {interaction.user}"
+                reason=reason
+            )
+
+            # Create all channels concurrently; gather preserves the definition order.
+            # No overwrites are sent, so each channel syncs with the category's permissions
+            results = await asyncio.gather(
+                *(
+                    bounded(interaction.guild.create_text_channel(
+                        name=channel_name,
+                        category=category,
+                        topic=channel_topic,
+                        nsfw=False,
+                        reason=reason
+                    ))
+                    for channel_name, channel_topic in NSFW_CHANNELS
+                ),
+                return_exceptions=True
             )
+            # Test for BaseException so a cancelled create isn't mistaken for a channel
+            created_channels = [result for result in results if not isinstance(result, BaseException)]
+
+            # Roll back the partial setup if any channel failed to create
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                rollback_reason = f"Rolling back failed NSFW setup by {actor}"
+                for item in (*created_channels, category, role):
+                    try:
+                        await item.delete(reason=rollback_reason)
+                    except discord.HTTPException:
+                        pass
+                raise errors[0]
 
-            # Save responsible user info (store in JSON file, not topic)
+            # Save responsible user info (store in JSON file, not topic) once the setup is known to stick
             if responsible:
-                set_responsible(category.id, responsible.id, category.name)
-
-            # Define channels to create
-            channels_to_create = [
-                {"name": "dm-requests", "topic": "Request DMs and private content"},
-                {"name": "pics", "topic": "Share and discuss pictures"},
-                {"name": "vids", "topic": "Share and discuss videos"},
-                {"name": "nsfw-chat", "topic": "General NSFW discussion"},
-                {"name": "ai-content", "topic": "AI-generated NSFW content"},
-                {"name": "tributes", "topic": "Tribute content and requests"}
-            ]
-
-            created_channels = []
-            
-            for channel_info in channels_to_create:
-                channel = await interaction.guild.create_text_channel(
-                    name=channel_info["name"],
-                    category=category,
-                    topic=channel_info["topic"],
-                    nsfw=False,
-                    reason=f"NSFW setup by {interaction.user}"
-                )
-                created_channels.append(channel)
+                await set_responsible(category.id, responsible.id, category.name)
 
             # Create success embed
             embed = Utils.create_success_embed(
@@ -174,17 +275,25 @@ class NSFWManagement(commands.Cog):
                 inline=False
             )
             
-            channel_list = "\n".join([f"• {channel.mention}" for channel in created_channels])
+            channel_list = "\n".join(f"• {channel.mention}" for channel in created_channels)
             embed.add_field(
                 name="📺 Channels Created",
                 value=channel_list,
                 inline=False            )
             
+            if moderator_role:
+                access_control = (
+                    f"Only members with the {role.mention} role can access these channels.\n"
+                    "Moderators can also view and moderate these channels."
+                )
+            else:
+                access_control = (
+                    f"Only members with the {role.mention} role can access these channels.\n"
+                    f"⚠️ No 'Moderator' role found - only {role.mention} members have access."
+                )
             embed.add_field(
                 name="🔒 Access Control",
-                value=f"Only members with the {role.mention} role can access these channels." + 
-                      (f"\nModerators can also view and moderate these channels." if moderator_role else 
-                       f"\n⚠️ No 'Moderator' role found - only {role.mention} members have access."),
+                value=access_control,
                 inline=False
             )
             
@@ -203,7 +312,10 @@ class NSFWManagement(commands.Cog):
 
             await Utils.send_response(interaction, embed=embed)            # Log the action
             moderator_access = "with Moderator role access" if moderator_role else "without Moderator role (not found)"
-            self.bot.logger.info(f"NSFW setup completed by {interaction.user} in {interaction.guild.name}: Role '{role_name}', Category '{category_name}', {len(created_channels)} channels, {moderator_access}")
+            self.bot.logger.info(
+                "NSFW setup completed by %s in %s: Role '%s', Category '%s', %d channels, %s",
+                actor, interaction.guild.name, role_name, category_name, len(created_channels), moderator_access
+            )
 
         except discord.Forbidden:
             await Utils.send_response(
@@ -236,23 +348,25 @@ class NSFWManagement(commands.Cog):
         """Remove NSFW category, channels, and role"""
         # Superuser bypass
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_channels", "manage_roles"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["manage_channels", "manage_roles"]):
+            if not await Utils.check_all_permissions(interaction, MANAGE_CHANNELS_ROLES_MASK, MANAGE_CHANNELS_ROLES_MASK):
                 return
 
         # Defer the response as this will take a while to delete all channels
         await interaction.response.defer()
 
         try:
-            role_name = f"{name} Gooner"
-            category_name = f"{name} NSFW"
+            role_name = f"{name}{GOONER_SUFFIX}"
+            category_name = f"{name}{NSFW_SUFFIX}"
+            actor = str(interaction.user)
+            reason = f"NSFW cleanup by {actor}"
             
+            roles_by_name, categories_by_name = get_guild_index(interaction.guild)
+
             # Find the role
-            role = discord.utils.get(interaction.guild.roles, name=role_name)
+            role = roles_by_name.get(role_name)
             
             # Find the category
-            category = discord.utils.get(interaction.guild.categories, name=category_name)
+            category = categories_by_name.get(category_name)
             
             if not role and not category:
                 await Utils.send_response(
@@ -263,39 +377,87 @@ class NSFWManagement(commands.Cog):
                 return
 
             deleted_items = []
+            failed_items = []
+            final_deletes = []
+            final_labels = []
             
             # Delete channels in category
             if category:
+                # Channel deletes are independent, so issue them concurrently
+                channels = category.channels
+                results = await asyncio.gather(
+                    *(bounded(channel.delete(reason=reason)) for channel in channels),
+                    return_exceptions=True
+                )
                 channels_deleted = 0
-                for channel in category.channels:
-                    await channel.delete(reason=f"NSFW cleanup by {interaction.user}")
-                    channels_deleted += 1
-                
-                # Delete category
-                await category.delete(reason=f"NSFW cleanup by {interaction.user}")
-                deleted_items.append(f"Category '{category_name}' and {channels_deleted} channels")
+                channels_failed = 0
+                for channel, result in zip(channels, results):
+                    if isinstance(result, Exception):
+                        self.bot.logger.warning("Failed to delete channel %s during NSFW cleanup: %s", channel.name, result)
+                        failed_items.append(f"Channel '{channel.name}' ({type(result).__name__})")
+                        channels_failed += 1
+                    else:
+                        channels_deleted += 1
+
+                # Delete category once it is empty; keep it if channels are left so they aren't orphaned
+                if channels_failed:
+                    failed_items.append(f"Category '{category_name}' (kept, {channels_failed} channels remain)")
+                else:
+                    final_deletes.append(bounded(category.delete(reason=reason)))
+                    final_labels.append(f"Category '{category_name}'")
+                if channels_deleted:
+                    deleted_items.append(f"{channels_deleted} channels")
 
             # Delete role
             if role:
-                await role.delete(reason=f"NSFW cleanup by {interaction.user}")
-                deleted_items.append(f"Role '{role_name}'")
-
-            # Create success embed
-            embed = Utils.create_success_embed(
-                f"Successfully cleaned up NSFW setup for '{name}'",
-                "NSFW Cleanup Complete"
-            )
+                final_deletes.append(bounded(role.delete(reason=reason)))
+                final_labels.append(f"Role '{role_name}'")
+
+            # The category and role deletes are independent of each other
+            results = await asyncio.gather(*final_deletes, return_exceptions=True)
+            for label, result in zip(final_labels, results):
+                if isinstance(result, Exception):
+                    self.bot.logger.warning("Failed to delete %s during NSFW cleanup: %s", label, result)
+                    failed_items.append(f"{label} ({type(result).__name__})")
+                else:
+                    deleted_items.append(label)
+
+            # Create result embed, flagging a partial cleanup
+            if failed_items and not deleted_items:
+                embed = Utils.create_error_embed(
+                    f"Could not clean up NSFW setup for '{name}'; no items were deleted.",
+                    "NSFW Cleanup Failed"
+                )
+            elif failed_items:
+                embed = Utils.create_warning_embed(
+                    f"Partially cleaned up NSFW setup for '{name}'; some items could not be deleted.",
+                    "NSFW Cleanup Incomplete"
+                )
+            else:
+                embed = Utils.create_success_embed(
+                    f"Successfully cleaned up NSFW setup for '{name}'",
+                    "NSFW Cleanup Complete"
+                )
             
-            embed.add_field(
-                name="🗑️ Deleted Items",
-                value="\n".join([f"• {item}" for item in deleted_items]),
-                inline=False
-            )
+            if deleted_items:
+                embed.add_field(
+                    name="🗑️ Deleted Items",
+                    value="\n".join(f"• {item}" for item in deleted_items),
+                    inline=False
+                )
+            if failed_items:
+                embed.add_field(
+                    name="⚠️ Failed to Delete",
+                    value=Utils.truncate_text("\n".join(f"• {item}" for item in failed_items), 1024),
+                    inline=False
+                )
 
             await Utils.send_response(interaction, embed=embed)
 
             # Log the action
-            self.bot.logger.info(f"NSFW cleanup completed by {interaction.user} in {interaction.guild.name}: {', '.join(deleted_items)}")
+            self.bot.logger.info(
+                "NSFW cleanup completed by %s in %s: %s", actor, interaction.guild.name, ", ".join(deleted_items)
+            )
 
         except discord.Forbidden:
             await Utils.send_response(
@@ -328,8 +490,11 @@ class NSFWManagement(commands.Cog):
             )
             return
 
+        # Defer the response as the sync round-trip can outlast the interaction window
+        await interaction.response.defer(ephemeral=True)
+
         try:
-            # Clear guild commands
+            # Clear guild commands; sync is a single bulk-overwrite PUT of the (now empty) guild set
             interaction.client.tree.clear_commands(guild=interaction.guild)
             await interaction.client.tree.sync(guild=interaction.guild)
             
@@ -339,7 +504,7 @@ class NSFWManagement(commands.Cog):
             )
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             
-            self.bot.logger.info(f"Commands cleared by {interaction.user} in {interaction.guild.name}")
+            self.bot.logger.info("Commands cleared by %s in %s", interaction.user, interaction.guild.name)
             
         except Exception as e:
             await Utils.send_response(
@@ -364,9 +529,7 @@ class NSFWManagement(commands.Cog):
         """List or close inactive NSFW categories and associated roles"""
         # Superuser bypass
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_channels", "manage_roles"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["manage_channels", "manage_roles"]):
+            if not await Utils.check_all_permissions(interaction, MANAGE_CHANNELS_ROLES_MASK, MANAGE_CHANNELS_ROLES_MASK):
                 return
 
         # Defer the response as this might take a while to check message history
@@ -378,37 +541,40 @@ class NSFWManagement(commands.Cog):
         roles_to_delete = []
 
         # Find NSFW categories (optionally filter by name)
-        nsfw_categories = [cat for cat in interaction.guild.categories if (name is None or cat.name == f"{name} NSFW")]
+        roles_by_name, categories_by_name = get_guild_index(interaction.guild)
+        if name is None:
+            nsfw_categories = [cat for cat in interaction.guild.categories if cat.name.endswith(NSFW_SUFFIX)]
+        else:
+            target = categories_by_name.get(f"{name}{NSFW_SUFFIX}")
+            nsfw_categories = [target] if target else []
         if not nsfw_categories:
+            message = f"No NSFW categories found with name {name}." if name else "No NSFW categories found."
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed(f"No NSFW categories found{' with name ' + name if name else ''}.") ,
+                embed=Utils.create_error_embed(message),
                 ephemeral=True
             )
             return
 
+        # text_channels rebuilds a sorted list on every access, so read it once per category
+        text_channels = {category.id: category.text_channels for category in nsfw_categories}
+
+        # Activity comes from cached snowflakes only, so the scan needs no requests
+        active_category_ids = {
+            category.id
+            for category in nsfw_categories
+            if any(last_activity(channel) >= threshold for channel in text_channels[category.id])
+        }
+
         for category in nsfw_categories:
             checked_categories += 1
-            all_inactive = True
-            for channel in category.text_channels:
-                try:
-                    last_message = None
-                    async for msg in channel.history(limit=1, oldest_first=False):
-                        last_message = msg
-                        break
-                    if last_message and last_message.created_at >= threshold:
-                        all_inactive = False
-                        break
-                except discord.Forbidden:
-                    continue  # Skip channels we can't access
-                except Exception:
-                    continue
-            if all_inactive and category.text_channels:
+            all_inactive = category.id not in active_category_ids
+            if all_inactive and text_channels[category.id]:
                 categories_to_delete.append(category)
                 # Try to find the associated role
-                prefix = category.name[:-5] if category.name.endswith(" NSFW") else category.name
-                role_name = f"{prefix} Gooner"
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
+                prefix = category.name.removesuffix(NSFW_SUFFIX)
+                role_name = f"{prefix}{GOONER_SUFFIX}"
+                role = roles_by_name.get(role_name)
                 if role:
                     roles_to_delete.append(role)
 
@@ -421,7 +587,7 @@ class NSFWManagement(commands.Cog):
             if categories_to_delete:
                 embed.add_field(
                     name="Categories to Delete",
-                    value="\n".join([f"• {cat.name}" for cat in categories_to_delete]),
+                    value="\n".join(f"• {cat.name}" for cat in categories_to_delete),
                     inline=False
                 )
             else:
@@ -433,66 +599,121 @@ class NSFWManagement(commands.Cog):
             if roles_to_delete:
                 embed.add_field(
                     name="Roles to Delete (if category is deleted)",
-                    value="\n".join([f"• {role.name}" for role in roles_to_delete]),
+                    value="\n".join(f"• {role.name}" for role in roles_to_delete),
                     inline=False
                 )
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             return
 
         # Actually delete inactive categories and roles
+        actor = str(interaction.user)
+        reason = f"Pruned due to inactivity (>{days} days) by {actor}"
+        # First delete the channels of every inactive category concurrently
+        channel_jobs = [
+            (category, channel)
+            for category in categories_to_delete
+            for channel in text_channels[category.id]
+        ]
+        results = await asyncio.gather(
+            *(
+                bounded(channel.delete(reason=reason))
+                for _, channel in channel_jobs
+            ),
+            return_exceptions=True
+        )
+        failed_items = [
+            f"Channel '{channel.name}' ({type(result).__name__})"
+            for (_, channel), result in zip(channel_jobs, results)
+            if isinstance(result, Exception)
+        ]
+        failed_category_ids = {
+            category.id
+            for (category, _), result in zip(channel_jobs, results)
+            if isinstance(result, Exception)
+        }
+        emptied_categories = [
+            category for category in categories_to_delete if category.id not in failed_category_ids
+        ]
+
+        # Then delete the emptied categories and the roles together
+        results = await asyncio.gather(
+            *(
+                bounded(category.delete(reason=reason))
+                for category in emptied_categories
+            ),
+            *(
+                bounded(role.delete(reason=reason))
+                for role in roles_to_delete
+            ),
+            return_exceptions=True
+        )
+        category_results = results[:len(emptied_categories)]
+        role_results = results[len(emptied_categories):]
+
         deleted_categories = []
-        deleted_roles = []
-        for category in categories_to_delete:
+        notifications = []
+        for category, result in zip(emptied_categories, category_results):
+            if isinstance(result, Exception):
+                failed_items.append(f"Category '{category.name}' ({type(result).__name__})")
+                continue
+            deleted_categories.append(category.name)
             # Get responsible user and name from JSON file
             responsible_id, stored_name = get_responsible(category.id)
-            try:
-                for channel in category.text_channels:
-                    await channel.delete(reason=f"Pruned due to inactivity (>{days} days) by {interaction.user}")
-                await category.delete(reason=f"Pruned due to inactivity (>{days} days) by {interaction.user}")
-                deleted_categories.append(category.name)
-                # DM responsible user if found
-                if responsible_id:
-                    user = interaction.guild.get_member(responsible_id)
-                    if user:
-                        try:
-                            cat_display = stored_name or category.name
-                            await user.send(f"Your NSFW category '{cat_display}' was purged due to inactivity.")
-                        except Exception:
-                            pass
-            except Exception:
-                continue
-        for role in roles_to_delete:
-            try:
-                await role.delete(reason=f"Pruned due to inactivity (>{days} days) by {interaction.user}")
+            # DM responsible user if found
+            if responsible_id:
+                user = interaction.guild.get_member(responsible_id)
+                if user:
+                    cat_display = stored_name or category.name
+                    notifications.append(
+                        bounded(user.send(f"Your NSFW category '{cat_display}' was purged due to inactivity."))
+                    )
+        # Send the DMs together; users with closed DMs are skipped silently
+        await asyncio.gather(*notifications, return_exceptions=True)
+
+        deleted_roles = []
+        for role, result in zip(roles_to_delete, role_results):
+            if isinstance(result, Exception):
+                failed_items.append(f"Role '{role.name}' ({type(result).__name__})")
+            else:
                 deleted_roles.append(role.name)
-            except Exception:
-                continue
 
         # Report results
-        if deleted_categories or deleted_roles:
-            embed = Utils.create_success_embed(
-                f"Closed {len(deleted_categories)} inactive NSFW category(ies) and {len(deleted_roles)} role(s).",
-                "NSFW Prune Complete"
+        summary = f"Closed {len(deleted_categories)} inactive NSFW category(ies) and {len(deleted_roles)} role(s)."
+        if failed_items:
+            embed = Utils.create_warning_embed(
+                f"{summary} Some items could not be deleted.",
+                "NSFW Prune Incomplete"
             )
-            if deleted_categories:
-                embed.add_field(
-                    name="🗑️ Categories Closed",
-                    value="\n".join([f"• {cat}" for cat in deleted_categories]),
-                    inline=False
-                )
-            if deleted_roles:
-                embed.add_field(
-                    name="Roles Deleted",
-                    value="\n".join([f"• {role}" for role in deleted_roles]),
-                    inline=False
-                )
+        elif deleted_categories or deleted_roles:
+            embed = Utils.create_success_embed(summary, "NSFW Prune Complete")
         else:
             embed = Utils.create_success_embed(
                 f"No inactive NSFW categories or roles found (checked {checked_categories} category(ies)).",
                 "NSFW Prune Complete"
             )
+        if deleted_categories:
+            embed.add_field(
+                name="🗑️ Categories Closed",
+                value="\n".join(f"• {cat}" for cat in deleted_categories),
+                inline=False
+            )
+        if deleted_roles:
+            embed.add_field(
+                name="Roles Deleted",
+                value="\n".join(f"• {role}" for role in deleted_roles),
+                inline=False
+            )
+        if failed_items:
+            embed.add_field(
+                name="⚠️ Failed to Delete",
+                value=Utils.truncate_text("\n".join(f"• {item}" for item in failed_items), 1024),
+                inline=False
+            )
         await Utils.send_response(interaction, embed=embed, ephemeral=True)
-        self.bot.logger.info(f"NSFW prune by {interaction.user} in {interaction.guild.name}: {len(deleted_categories)} categories and {len(deleted_roles)} roles closed.")
+        self.bot.logger.info(
+            "NSFW prune by %s in %s: %d categories and %d roles closed.",
+            actor, interaction.guild.name, len(deleted_categories), len(deleted_roles)
+        )
 
     @app_commands.command(name="set_nsfw_responsible", description="Set or update the responsible user for an existing NSFW category")
     @app_commands.describe(
@@ -508,25 +729,47 @@ class NSFWManagement(commands.Cog):
         """Set or update the responsible user for an existing NSFW category"""
         # Superuser bypass
         if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_channels", "manage_roles"]):
-                return
-            if not await Utils.check_bot_permissions(interaction, ["manage_channels", "manage_roles"]):
+            if not await Utils.check_all_permissions(interaction, MANAGE_CHANNELS_ROLES_MASK, MANAGE_CHANNELS_ROLES_MASK):
                 return
         # Only allow for NSFW categories (by name convention)
-        if not category.name.endswith(" NSFW"):
+        if not category.name.endswith(NSFW_SUFFIX):
             await Utils.send_response(
                 interaction,
                 embed=Utils.create_error_embed("Selected category does not appear to be an NSFW category."),
                 ephemeral=True
             )
             return
-        set_responsible(category.id, user.id, category.name)
+        await set_responsible(category.id, user.id, category.name)
         embed = Utils.create_success_embed(
             f"Set {user.mention} as responsible for category '{category.name}'.",
             "Responsible User Updated"
         )
         await Utils.send_response(interaction, embed=embed, ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        guild_indexes.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        guild_indexes.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        guild_indexes.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        guild_indexes.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        guild_indexes.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        guild_indexes.pop(after.guild.id, None)
+
     async def cog_load(self):
         # Start background task for NSFW prune warnings
         self.nsfw_warning_task = self.bot.loop.create_task(self.nsfw_prune_warning_loop())
@@ -543,7 +786,7 @@ class NSFWManagement(commands.Cog):
                 await self.send_nsfw_prune_warnings()
             except Exception as e:
                 if hasattr(self.bot, 'logger'):
-                    self.bot.logger.error(f"NSFW prune warning loop error: {e}")
+                    self.bot.logger.error("NSFW prune warning loop error: %s", e)
             await discord.utils.sleep_until((discord.utils.utcnow() + timedelta(days=1)).replace(hour=4, minute=0, second=0, microsecond=0))
 
     async def send_nsfw_prune_warnings(self):
@@ -552,20 +795,9 @@ class NSFWManagement(commands.Cog):
         threshold = discord.utils.utcnow() - timedelta(days=prune_days - warning_days)
         for guild in self.bot.guilds:
             for category in guild.categories:
-                if not category.name.endswith(" NSFW") or not category.text_channels:
+                if not category.name.endswith(NSFW_SUFFIX) or not category.text_channels:
                     continue
-                all_inactive = True
-                for channel in category.text_channels:
-                    try:
-                        last_message = None
-                        async for msg in channel.history(limit=1, oldest_first=False):
-                            last_message = msg
-                            break
-                        if last_message and last_message.created_at >= threshold:
-                            all_inactive = False
-                            break
-                    except Exception:
-                        continue
+                all_inactive = all(last_activity(channel) < threshold for channel in category.text_channels)
                 if all_inactive:
                     responsible_id, cat_name = get_responsible(category.id)
                     if responsible_id:
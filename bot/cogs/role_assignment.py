@@ -1,114 +1,299 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
 import discord
+from asyncio_throttle import Throttler
 from discord import app_commands
 from discord.ext import commands
-from typing import List
+from typing import List, Optional, Tuple
 
 from bot.utils.utils import Utils, is_superuser
 
+# Validation error messages per self-service action, keyed by RoleAssignment.classify_role results
+ROLE_VALIDATION_ERRORS = {
+    "join": {
+        "not_gooner": "You can only assign Gooner roles to yourself.",
+        "not_manageable": "This role cannot be assigned by the bot."
+    },
+    "leave": {
+        "not_gooner": "You can only remove Gooner roles from yourself.",
+        "not_manageable": "This role cannot be removed by the bot."
+    },
+    "toggle": {
+        "not_gooner": "You can only toggle Gooner roles.",
+        "not_manageable": "This role cannot be managed by the bot."
+    }
+}
+
+# Static text of the /roles usage field and the single-role responses
+HOW_TO_USE = (
+    "• `/join_role` - Get a specific role\n"
+    "• `/leave_role` - Remove a specific role\n"
+    "• `/toggle_role` - Switch a role on/off\n"
+    "• `/join_all_roles` - Get all available roles\n"
+    "• `/leave_all_roles` - Remove all your roles\n"
+    "• `/sync_roles` - Join or leave every role in one step"
+)
+ROLES_EMBED_COLOR = discord.Color.purple()
+ROLE_ADDED_TITLE = "Role Added"
+ROLE_ADDED_FIELD = "🎉 Welcome!"
+ROLE_REMOVED_TITLE = "Role Removed"
+ROLE_REMOVED_FIELD = "👋 Goodbye!"
+
+# Audit reason, log verb for added roles and failure messages per self-service action
+ROLE_ACTION_TEXT = {
+    "join": {
+        "reason": "Self-assigned Gooner role",
+        "verb": "assigned",
+        "forbidden": "I don't have permission to assign this role.",
+        "failed": "Failed to assign role"
+    },
+    "leave": {
+        "reason": "Self-removed Gooner role",
+        "verb": "removed",
+        "forbidden": "I don't have permission to remove this role.",
+        "failed": "Failed to remove role"
+    },
+    "toggle": {
+        "reason": "Self-toggled Gooner role",
+        "verb": "added",
+        "forbidden": "I don't have permission to manage this role.",
+        "failed": "Failed to toggle role"
+    }
+}
+
+
+class RoleEditLimiter:
+    """Concurrency limit for a guild's role edits that can be resized while edits are in flight"""
+
+    def __init__(self, concurrency: float = 2.0):
+        self.concurrency = concurrency  # AIMD-tuned permit count, floored when admitting edits
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait until an edit fits under the current limit and claim a slot"""
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < math.floor(self.concurrency))
+            self.in_flight += 1
+
+    async def release(self):
+        """Free a slot and wake edits waiting for one"""
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    async def resize(self, scale: float = 1.0, step: float = 0.0):
+        """Scale then step the current limit, clamped to 1-8 concurrent edits"""
+        async with self.condition:
+            # Applied to the live value so overlapping edits' adjustments compound instead of overwriting
+            self.concurrency = max(1.0, min(8.0, self.concurrency * scale + step))
+            self.condition.notify_all()
+
 
 class RoleAssignment(commands.Cog):
     """Role assignment functionality for self-assignable roles"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.gooner_role_cache = {}  # Gooner roles per guild: {guild_id: [(role, lowercased name, mention), ...]}
+        self.gooner_role_ids = {}  # Gooner role IDs per guild: {guild_id: {role_id, ...}}
+        self.role_limiters = {}  # Concurrent role edits per guild: {guild_id: RoleEditLimiter}
+        self.role_rate_limits = {}  # Last reported role bucket per guild: {guild_id: (remaining, reset_at)}
+        self.roles_embed_cache = OrderedDict()  # Recent /roles embeds, LRU: {key: (rendered_at, entries, embed)}
+        self.role_match_cache = OrderedDict()  # Recent autocomplete matches, LRU: {(guild_id, input): (matched_at, entries, roles)}
+        self.role_throttlers = {}  # Sliding window of role edits per guild: {guild_id: Throttler}
+        self.member_role_locks = {}  # Serialised role edits per member: {(guild_id, user_id): [Lock, holders and waiters]}
+        self.error_embeds = {}  # Prebuilt error embeds for fixed messages: {(description, title): embed}
+        self.action_log_queue = asyncio.Queue()  # Pending self-service log lines: (message, args)
+        # Static parts of the join/leave responses, copied and filled in per role
+        self.role_added_template = Utils.create_success_embed("", ROLE_ADDED_TITLE)
+        self.role_added_template.add_field(name=ROLE_ADDED_FIELD, value="", inline=False)
+        self.role_removed_template = Utils.create_success_embed("", ROLE_REMOVED_TITLE)
+        self.role_removed_template.add_field(name=ROLE_REMOVED_FIELD, value="", inline=False)
+
+    def get_gooner_entries(self, guild: discord.Guild) -> List[Tuple[discord.Role, str, str]]:
+        """Get all Gooner roles with their lowercased names and mentions"""
+        entries = self.gooner_role_cache.get(guild.id)
+        if entries is None:
+            entries = []
+            for role in guild.roles:
+                lowered = role.name.lower()
+                if "gooner" in lowered and not role.managed:
+                    entries.append((role, lowered, role.mention))
+            self.gooner_role_cache[guild.id] = entries
+            self.gooner_role_ids[guild.id] = {role.id for role, _, _ in entries}
+        return entries
+
+    def get_gooner_ids(self, guild: discord.Guild) -> set:
+        """Get the IDs of all Gooner roles in a guild"""
+        if guild.id not in self.gooner_role_ids:
+            self.get_gooner_entries(guild)
+        return self.gooner_role_ids[guild.id]
 
     def get_gooner_roles(self, guild: discord.Guild) -> List[discord.Role]:
         """Get all roles that contain 'Gooner' in their name"""
-        return [role for role in guild.roles if "gooner" in role.name.lower() and not role.managed]
-
-    @app_commands.command(name="roles", description="View and assign available Gooner roles")
-    async def view_roles(self, interaction: discord.Interaction):
-        """Display available Gooner roles for self-assignment"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
-        
-        if not gooner_roles:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_info_embed(
-                    "No Gooner roles are currently available for assignment.",
-                    "No Roles Available"
-                ),
-                ephemeral=True
-            )
-            return
-
-        # Create embed showing available roles
-        embed = Utils.create_embed(
-            title="🎭 Available Gooner Roles",
-            description="Select the roles you'd like to join or leave:",
-            color=discord.Color.purple()
+        return [role for role, _, _ in self.get_gooner_entries(guild)]
+
+    def role_added_embed(self, role: discord.Role) -> discord.Embed:
+        """Build the response for a Gooner role the user joined"""
+        mention = role.mention
+        embed = self.role_added_template.copy()
+        embed.description = f"Successfully joined {mention}!"
+        embed.timestamp = Utils.utcnow()
+        embed.set_field_at(
+            0,
+            name=ROLE_ADDED_FIELD,
+            value=f"You now have access to content associated with {mention}",
+            inline=False
         )
-
-        # Group roles by whether user has them
-        user_roles = [role.id for role in interaction.user.roles]
-        has_roles = [role for role in gooner_roles if role.id in user_roles]
-        available_roles = [role for role in gooner_roles if role.id not in user_roles]
-
-        if has_roles:
-            embed.add_field(
-                name="✅ Your Current Roles",
-                value="\n".join([f"• {role.mention}" for role in has_roles]),
-                inline=False
-            )
-
-        if available_roles:            embed.add_field(
-                name="📝 Available to Join",
-                value="\n".join([f"• {role.mention}" for role in available_roles]),
-                inline=False
-            )
-
-        embed.add_field(
-            name="💡 How to Use",
-            value="• `/join_role` - Get a specific role\n• `/leave_role` - Remove a specific role\n• `/toggle_role` - Switch a role on/off\n• `/join_all_roles` - Get all available roles\n• `/leave_all_roles` - Remove all your roles",
+        return embed
+
+    def role_removed_embed(self, role: discord.Role) -> discord.Embed:
+        """Build the response for a Gooner role the user left"""
+        mention = role.mention
+        embed = self.role_removed_template.copy()
+        embed.description = f"Successfully left {mention}!"
+        embed.timestamp = Utils.utcnow()
+        embed.set_field_at(
+            0,
+            name=ROLE_REMOVED_FIELD,
+            value=f"You no longer have access to content associated with {mention}",
             inline=False
         )
-
-        await Utils.send_response(interaction, embed=embed, ephemeral=True)
-
-    @app_commands.command(name="join_role", description="Join a Gooner role")
-    @app_commands.describe(role="The Gooner role you want to join")
-    async def join_role(self, interaction: discord.Interaction, role: str):
-        """Allow users to join a Gooner role"""
-        # Convert role ID string to role object
+        return embed
+
+    def error_embed(self, description: str, title: str = "Error") -> discord.Embed:
+        """Copy a prebuilt error embed for a fixed message, stamped with the current time"""
+        template = self.error_embeds.get((description, title))
+        if template is None:
+            template = self.error_embeds[(description, title)] = Utils.create_error_embed(description, title)
+        embed = template.copy()
+        embed.timestamp = Utils.utcnow()
+        return embed
+
+    def record_rate_limit(self, guild_id: int, response):
+        """Remember the rate limit bucket state Discord reported in a response's headers"""
+        if response is None:
+            return
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            self.role_rate_limits[guild_id] = (int(remaining), time.monotonic() + float(reset_after))
+
+    @asynccontextmanager
+    async def role_slot(self, guild_id: int):
+        """Hold one of a guild's role edit slots, spacing edits to stay under Discord's rate limit"""
+        limiter = self.role_limiters.setdefault(guild_id, RoleEditLimiter())
+        throttler = self.role_throttlers.setdefault(guild_id, Throttler(rate_limit=8, period=10))
+        await limiter.acquire()
         try:
-            role_obj = interaction.guild.get_role(int(role))
-            if not role_obj:
-                await Utils.send_response(
-                    interaction,
-                    embed=Utils.create_error_embed("Role not found."),
-                    ephemeral=True
-                )
-                return
-        except ValueError:
+            async with throttler:
+                # Pause until the bucket resets if Discord reported it nearly exhausted
+                rate_limit = self.role_rate_limits.pop(guild_id, None)
+                if rate_limit and rate_limit[0] <= 2:
+                    wait = rate_limit[1] - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+
+                started = time.monotonic()
+                try:
+                    yield
+                except discord.HTTPException as e:
+                    self.record_rate_limit(guild_id, e.response)
+                    # Back off multiplicatively when Discord pushes back
+                    if e.status in (429, 502):
+                        await limiter.resize(scale=0.5)
+                    raise
+                # Grow additively while edits are fast, shrink when they slow down
+                elapsed = time.monotonic() - started
+                if elapsed <= 0.5:
+                    await limiter.resize(step=0.5)
+                elif elapsed > 1.5:
+                    await limiter.resize(scale=0.5)
+        finally:
+            await limiter.release()
+
+    async def retry_role_op(self, guild_id: int, operation, max_attempts: int = 3):
+        """Run a role edit, retrying rate limits and server errors with jittered exponential backoff"""
+        for attempt in range(max_attempts):
+            try:
+                async with self.role_slot(guild_id):
+                    return await operation()
+            except discord.HTTPException as e:
+                if attempt == max_attempts - 1 or not (e.status == 429 or e.status >= 500):
+                    raise
+                retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+                delay = float(retry_after) if retry_after else min(30, 0.5 * 2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, 0.25))
+
+    @asynccontextmanager
+    async def member_role_lock(self, interaction: discord.Interaction):
+        """Hold the invoking member's role edit lock so their role changes apply one at a time"""
+        key = (interaction.guild.id, interaction.user.id)
+        entry = self.member_role_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            # Drop the lock once nobody holds or waits on it
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.member_role_locks[key]
+
+    async def edit_member_roles(self, interaction: discord.Interaction, update, reason: str):
+        """Apply a role list update to the invoking member, one edit at a time per member"""
+        async def apply():
+            # The interaction payload and the gateway cache can both lag behind other role changes,
+            # so read the member's current roles right before replacing the whole list
+            member = await interaction.guild.fetch_member(interaction.user.id)
+            # roles[0] is @everyone, which can't be set explicitly
+            return await member.edit(roles=update(member.roles[1:]), reason=reason)
+
+        async with self.member_role_lock(interaction):
+            await self.retry_role_op(interaction.guild.id, apply)
+
+    def classify_role(self, role: discord.Role, me: discord.Member) -> Optional[str]:
+        """Get why a role can't be self-managed, or None if it can"""
+        if role.id not in self.get_gooner_ids(role.guild):
+            # Managed roles are left out of the Gooner cache but still deserve the clearer error
+            return "not_manageable" if role.managed and "gooner" in role.name.lower() else "not_gooner"
+        if role >= me.top_role:
+            return "not_manageable"
+        return None
+
+    async def resolve_gooner_role(self, interaction: discord.Interaction, role: str, action: str) -> Optional[discord.Role]:
+        """Resolve a role ID option to a self-manageable Gooner role, responding with the error if it isn't one"""
+        # Convert role ID string to role object; typed text that isn't an ID can't name a role either
+        if not role.isdecimal() or (role_obj := interaction.guild.get_role(int(role))) is None:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("Invalid role ID."),
+                embed=self.error_embed("Role not found."),
                 ephemeral=True
             )
-            return
+            return None
 
-        role = role_obj  # Use the role object for the rest of the function
-        
-        # Check if role is a valid Gooner role
-        if "gooner" not in role.name.lower():
+        # Check if role is a valid Gooner role the bot can manage
+        if error := self.classify_role(role_obj, interaction.guild.me):
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("You can only assign Gooner roles to yourself."),
+                embed=self.error_embed(ROLE_VALIDATION_ERRORS[action][error]),
                 ephemeral=True
             )
-            return
+            return None
 
-        # Check if role is manageable by bot
-        if role.managed or role >= interaction.guild.me.top_role:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("This role cannot be assigned by the bot."),
-                ephemeral=True
-            )
-            return
+        return role_obj
 
+    async def do_join(self, interaction: discord.Interaction, role: discord.Role, action: str):
+        """Add a resolved Gooner role for the user who ran a self-service command"""
         # Check if user already has the role
-        if role in interaction.user.roles:
+        if interaction.user.get_role(role.id):
             await Utils.send_response(
                 interaction,
                 embed=Utils.create_info_embed(f"You already have the {role.mention} role."),
@@ -116,76 +301,36 @@ class RoleAssignment(commands.Cog):
             )
             return
 
+        text = ROLE_ACTION_TEXT[action]
         try:
-            # Add the role to the user
-            await interaction.user.add_roles(role, reason=f"Self-assigned Gooner role")
+            # Add the role under the member lock, so a bulk edit never reads roles from before this change
+            async with self.member_role_lock(interaction):
+                await self.retry_role_op(interaction.guild.id, lambda: interaction.user.add_roles(role, reason=text["reason"]))
             
-            embed = Utils.create_success_embed(
-                f"Successfully joined {role.mention}!",
-                "Role Added"
-            )
-            embed.add_field(
-                name="🎉 Welcome!",
-                value=f"You now have access to content associated with {role.mention}",
-                inline=False
-            )
+            embed = self.role_added_embed(role)
             
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             
             # Log the action
-            self.bot.logger.info(f"User {interaction.user} self-assigned role {role.name} in {interaction.guild.name}")
+            self.log_action("User %s self-%s role %s in %s", interaction.user, text["verb"], role.name, interaction.guild.name)
 
         except discord.Forbidden:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("I don't have permission to assign this role."),
+                embed=self.error_embed(text["forbidden"]),
                 ephemeral=True
             )
         except discord.HTTPException as e:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed(f"Failed to assign role: {str(e)}"),
+                embed=Utils.create_error_embed(f"{text['failed']}: {str(e)}"),
                 ephemeral=True
             )
 
-    @app_commands.command(name="leave_role", description="Leave a Gooner role")
-    @app_commands.describe(role="The Gooner role you want to leave")
-    async def leave_role(self, interaction: discord.Interaction, role: str):
-        if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_roles"]):
-                return
-        """Allow users to leave a Gooner role"""
-        # Convert role ID string to role object
-        try:
-            role_obj = interaction.guild.get_role(int(role))
-            if not role_obj:
-                await Utils.send_response(
-                    interaction,
-                    embed=Utils.create_error_embed("Role not found."),
-                    ephemeral=True
-                )
-                return
-        except ValueError:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("Invalid role ID."),
-                ephemeral=True
-            )
-            return
-
-        role = role_obj  # Use the role object for the rest of the function
-        
-        # Check if role is a valid Gooner role
-        if "gooner" not in role.name.lower():
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("You can only remove Gooner roles from yourself."),
-                ephemeral=True
-            )
-            return
-
+    async def do_leave(self, interaction: discord.Interaction, role: discord.Role, action: str):
+        """Remove a resolved Gooner role from the user who ran a self-service command"""
         # Check if user has the role
-        if role not in interaction.user.roles:
+        if not interaction.user.get_role(role.id):
             await Utils.send_response(
                 interaction,
                 embed=Utils.create_info_embed(f"You don't have the {role.mention} role."),
@@ -193,140 +338,200 @@ class RoleAssignment(commands.Cog):
             )
             return
 
+        text = ROLE_ACTION_TEXT[action]
         try:
-            # Remove the role from the user
-            await interaction.user.remove_roles(role, reason=f"Self-removed Gooner role")
+            # Remove the role under the member lock, so a bulk edit never reads roles from before this change
+            async with self.member_role_lock(interaction):
+                await self.retry_role_op(interaction.guild.id, lambda: interaction.user.remove_roles(role, reason=text["reason"]))
             
-            embed = Utils.create_success_embed(
-                f"Successfully left {role.mention}!",
-                "Role Removed"
-            )
-            embed.add_field(
-                name="👋 Goodbye!",
-                value=f"You no longer have access to content associated with {role.mention}",
-                inline=False
-            )
+            embed = self.role_removed_embed(role)
             
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             
             # Log the action
-            self.bot.logger.info(f"User {interaction.user} self-removed role {role.name} in {interaction.guild.name}")
+            self.log_action("User %s self-removed role %s in %s", interaction.user, role.name, interaction.guild.name)
 
         except discord.Forbidden:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("I don't have permission to remove this role."),
+                embed=self.error_embed(text["forbidden"]),
                 ephemeral=True
             )
         except discord.HTTPException as e:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed(f"Failed to remove role: {str(e)}"),
+                embed=Utils.create_error_embed(f"{text['failed']}: {str(e)}"),
                 ephemeral=True
             )
 
-    @app_commands.command(name="toggle_role", description="Toggle a Gooner role (join if you don't have it, leave if you do)")
-    @app_commands.describe(role="The Gooner role you want to toggle")
-    async def toggle_role(self, interaction: discord.Interaction, role: str):
-        if not is_superuser(interaction.user):
-            if not await Utils.check_permissions(interaction, ["manage_roles"]):
-                return
-        """Toggle a Gooner role - join if not present, leave if present"""
-        # Convert role ID string to role object
-        try:
-            role_obj = interaction.guild.get_role(int(role))
-            if not role_obj:
-                await Utils.send_response(
-                    interaction,
-                    embed=Utils.create_error_embed("Role not found."),
-                    ephemeral=True
-                )
-                return
-        except ValueError:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("Invalid role ID."),
-                ephemeral=True
-            )
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.gooner_role_cache.pop(role.guild.id, None)
+        self.gooner_role_ids.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.gooner_role_cache.pop(after.guild.id, None)
+        self.gooner_role_ids.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.gooner_role_cache.pop(role.guild.id, None)
+        self.gooner_role_ids.pop(role.guild.id, None)
+
+    async def cog_load(self):
+        # Start background task that writes self-service log lines in batches
+        self.action_log_task = self.bot.loop.create_task(self.drain_action_logs())
+
+    async def cog_unload(self):
+        # Cancel background task and flush whatever it didn't get to
+        if hasattr(self, 'action_log_task'):
+            self.action_log_task.cancel()
+        self.flush_action_logs([])
+
+    def log_action(self, message: str, *args):
+        """Queue a self-service log line so the command doesn't block on the log handler"""
+        if not self.bot.logger.isEnabledFor(logging.INFO):
             return
+        self.action_log_queue.put_nowait((message, args))
+
+    def flush_action_logs(self, batch: list):
+        """Write a batch of queued log lines, plus anything else already waiting, as one record"""
+        while not self.action_log_queue.empty():
+            batch.append(self.action_log_queue.get_nowait())
+        if batch:
+            self.bot.logger.info("\n".join(message % args if args else message for message, args in batch))
+
+    async def drain_action_logs(self):
+        while True:
+            self.flush_action_logs([await self.action_log_queue.get()])
 
-        role = role_obj  # Use the role object for the rest of the function
+    @app_commands.command(name="roles", description="View and assign available Gooner roles")
+    async def view_roles(self, interaction: discord.Interaction):
+        """Display available Gooner roles for self-assignment"""
+        await interaction.response.defer(ephemeral=True)
+
+        gooner_entries = self.get_gooner_entries(interaction.guild)
         
-        # Check if role is a valid Gooner role
-        if "gooner" not in role.name.lower():
+        if not gooner_entries:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("You can only toggle Gooner roles."),
+                embed=Utils.create_info_embed(
+                    "No Gooner roles are currently available for assignment.",
+                    "No Roles Available"
+                ),
                 ephemeral=True
             )
             return
 
-        # Check if role is manageable by bot
-        if role.managed or role >= interaction.guild.me.top_role:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("This role cannot be managed by the bot."),
-                ephemeral=True
-            )
+        user_roles = frozenset(role.id for role in interaction.user.roles)
+
+        # Reuse the embed rendered moments ago for the same user and role state
+        cache_key = (
+            interaction.guild.id,
+            interaction.user.id,
+            user_roles
+        )
+        cached = self.roles_embed_cache.get(cache_key)
+        # Only reuse embeds rendered from the current Gooner role list
+        if cached and cached[1] is gooner_entries and time.monotonic() - cached[0] < 5:
+            self.roles_embed_cache.move_to_end(cache_key)
+            await Utils.send_response(interaction, embed=cached[2], ephemeral=True)
             return
 
-        try:
-            if role in interaction.user.roles:
-                # Remove the role
-                await interaction.user.remove_roles(role, reason=f"Self-toggled Gooner role")
-                
-                embed = Utils.create_success_embed(
-                    f"Successfully left {role.mention}!",
-                    "Role Removed"
-                )
-                embed.add_field(
-                    name="👋 Goodbye!",
-                    value=f"You no longer have access to content associated with {role.mention}",
-                    inline=False
-                )
-                
-                action = "removed"
-            else:
-                # Add the role
-                await interaction.user.add_roles(role, reason=f"Self-toggled Gooner role")
-                
-                embed = Utils.create_success_embed(
-                    f"Successfully joined {role.mention}!",
-                    "Role Added"
-                )
-                embed.add_field(
-                    name="🎉 Welcome!",
-                    value=f"You now have access to content associated with {role.mention}",
-                    inline=False
-                )
-                
-                action = "added"
-            
-            await Utils.send_response(interaction, embed=embed, ephemeral=True)
-            
-            # Log the action
-            self.bot.logger.info(f"User {interaction.user} self-{action} role {role.name} in {interaction.guild.name}")
+        # Create embed showing available roles
+        embed = Utils.create_embed(
+            title="🎭 Available Gooner Roles",
+            description="Select the roles you'd like to join or leave:",
+            color=ROLES_EMBED_COLOR
+        )
 
-        except discord.Forbidden:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed("I don't have permission to manage this role."),
-                ephemeral=True
+        # Group roles by whether user has them
+        has_roles, available_roles = [], []
+        for role, _, mention in gooner_entries:
+            (has_roles if role.id in user_roles else available_roles).append(mention)
+
+        if has_roles:
+            embed.add_field(
+                name="✅ Your Current Roles",
+                value="\n".join(f"• {mention}" for mention in has_roles),
+                inline=False
             )
-        except discord.HTTPException as e:
-            await Utils.send_response(
-                interaction,
-                embed=Utils.create_error_embed(f"Failed to toggle role: {str(e)}"),
-                ephemeral=True
+
+        if available_roles:
+            embed.add_field(
+                name="📝 Available to Join",
+                value="\n".join(f"• {mention}" for mention in available_roles),
+                inline=False
             )
 
+        embed.add_field(
+            name="💡 How to Use",
+            value=HOW_TO_USE,
+            inline=False
+        )
+
+        self.roles_embed_cache[cache_key] = (time.monotonic(), gooner_entries, embed)
+        self.roles_embed_cache.move_to_end(cache_key)
+        if len(self.roles_embed_cache) > 1024:
+            self.roles_embed_cache.popitem(last=False)
+
+        await Utils.send_response(interaction, embed=embed, ephemeral=True)
+
+    @app_commands.command(name="join_role", description="Join a Gooner role")
+    @app_commands.describe(role="The Gooner role you want to join")
+    async def join_role(self, interaction: discord.Interaction, role: str):
+        """Allow users to join a Gooner role"""
+        # Defer so a slow role edit can't outlast the 3-second interaction window
+        await interaction.response.defer(ephemeral=True)
+
+        role = await self.resolve_gooner_role(interaction, role, "join")
+        if role is None:
+            return
+
+        await self.do_join(interaction, role, "join")
+
+    @app_commands.command(name="leave_role", description="Leave a Gooner role")
+    @app_commands.describe(role="The Gooner role you want to leave")
+    async def leave_role(self, interaction: discord.Interaction, role: str):
+        if not is_superuser(interaction.user):
+            if not await Utils.check_permissions(interaction, ["manage_roles"]):
+                return
+        """Allow users to leave a Gooner role"""
+        # Defer so a slow role edit can't outlast the 3-second interaction window
+        await interaction.response.defer(ephemeral=True)
+
+        role = await self.resolve_gooner_role(interaction, role, "leave")
+        if role is None:
+            return
+
+        await self.do_leave(interaction, role, "leave")
+
+    @app_commands.command(name="toggle_role", description="Toggle a Gooner role (join if you don't have it, leave if you do)")
+    @app_commands.describe(role="The Gooner role you want to toggle")
+    async def toggle_role(self, interaction: discord.Interaction, role: str):
+        if not is_superuser(interaction.user):
+            if not await Utils.check_permissions(interaction, ["manage_roles"]):
+                return
+        """Toggle a Gooner role - join if not present, leave if present"""
+        # Defer so a slow role edit can't outlast the 3-second interaction window
+        await interaction.response.defer(ephemeral=True)
+
+        role = await self.resolve_gooner_role(interaction, role, "toggle")
+        if role is None:
+            return
+
+        # Leave the role if the user has it, join it otherwise
+        do_toggle = self.do_leave if interaction.user.get_role(role.id) else self.do_join
+        await do_toggle(interaction, role, "toggle")
+
     @app_commands.command(name="join_all_roles", description="Join all available Gooner roles")
     async def join_all_roles(self, interaction: discord.Interaction):
         # No permission checks; any user can use this command
         """Allow users to join all available Gooner roles"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
+        gooner_entries = self.get_gooner_entries(interaction.guild)
         
-        if not gooner_roles:
+        if not gooner_entries:
             await Utils.send_response(
                 interaction,
                 embed=Utils.create_info_embed(
@@ -337,35 +542,44 @@ class RoleAssignment(commands.Cog):
             )
             return
 
-        # Get roles the user doesn't have
-        user_role_ids = [role.id for role in interaction.user.roles]
-        available_roles = [role for role in gooner_roles if role.id not in user_role_ids]
-        
-        if not available_roles:
+        # Every role edit would be rejected without Manage Roles, so fail before sorting roles
+        if not interaction.guild.me.guild_permissions.manage_roles:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_info_embed(
-                    "You already have all available Gooner roles!",
-                    "All Roles Assigned"
+                embed=self.error_embed(
+                    "I am missing the following permissions: Manage Roles",
+                    "Missing Bot Permissions"
                 ),
                 ephemeral=True
             )
             return
 
-        # Filter out roles that the bot can't manage
+        # Split the roles the user doesn't have by whether the bot can manage them, in one pass
+        user_role_ids = {role.id for role in interaction.user.roles}
+        top_pos = interaction.guild.me.top_role.position
         manageable_roles = []
         unmanageable_roles = []
         
-        for role in available_roles:
-            if role.managed or role >= interaction.guild.me.top_role:
-                unmanageable_roles.append(role)
-            else:
-                manageable_roles.append(role)
+        for role, _, mention in gooner_entries:
+            if role.id in user_role_ids:
+                continue
+            (unmanageable_roles if role.managed or role.position >= top_pos else manageable_roles).append((role, mention))
+        
+        if not manageable_roles and not unmanageable_roles:
+            await Utils.send_response(
+                interaction,
+                embed=Utils.create_info_embed(
+                    "You already have all available Gooner roles!",
+                    "All Roles Assigned"
+                ),
+                ephemeral=True
+            )
+            return
 
         if not manageable_roles:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed(
+                embed=self.error_embed(
                     "None of the available Gooner roles can be assigned by the bot.",
                     "No Manageable Roles"
                 ),
@@ -377,15 +591,20 @@ class RoleAssignment(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            # Add all manageable roles to the user
-            await interaction.user.add_roles(*manageable_roles, reason=f"Self-assigned all Gooner roles")
+            # Add all manageable roles to the user with a single member edit
+            added_ids = {role.id for role, _ in manageable_roles}
+            await self.edit_member_roles(
+                interaction,
+                lambda roles: [*(r for r in roles if r.id not in added_ids), *(role for role, _ in manageable_roles)],
+                "Self-assigned all Gooner roles"
+            )
             
             embed = Utils.create_success_embed(
                 f"Successfully joined {len(manageable_roles)} Gooner role(s)!",
                 "All Roles Added"
             )
             
-            role_list = "\n".join([f"• {role.mention}" for role in manageable_roles])
+            role_list = "\n".join(f"• {mention}" for _, mention in manageable_roles)
             embed.add_field(
                 name="🎉 Roles Added",
                 value=role_list,
@@ -393,7 +612,7 @@ class RoleAssignment(commands.Cog):
             )
             
             if unmanageable_roles:
-                unmanageable_list = "\n".join([f"• {role.mention}" for role in unmanageable_roles])
+                unmanageable_list = "\n".join(f"• {mention}" for _, mention in unmanageable_roles)
                 embed.add_field(
                     name="⚠️ Roles Not Added",
                     value=f"The following roles could not be assigned:\n{unmanageable_list}",
@@ -409,13 +628,13 @@ class RoleAssignment(commands.Cog):
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             
             # Log the action
-            role_names = [role.name for role in manageable_roles]
-            self.bot.logger.info(f"User {interaction.user} self-assigned all Gooner roles ({', '.join(role_names)}) in {interaction.guild.name}")
+            role_names = ", ".join(role.name for role, _ in manageable_roles)
+            self.log_action("User %s self-assigned all Gooner roles (%s) in %s", interaction.user, role_names, interaction.guild.name)
 
         except discord.Forbidden:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("I don't have permission to assign some or all of these roles."),
+                embed=self.error_embed("I don't have permission to assign some or all of these roles."),
                 ephemeral=True
             )
         except discord.HTTPException as e:
@@ -428,9 +647,9 @@ class RoleAssignment(commands.Cog):
     @app_commands.command(name="leave_all_roles", description="Leave all Gooner roles")
     async def leave_all_roles(self, interaction: discord.Interaction):
         """Allow users to leave all Gooner roles"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
+        gooner_entries = self.get_gooner_entries(interaction.guild)
         
-        if not gooner_roles:
+        if not gooner_entries:
             await Utils.send_response(
                 interaction,
                 embed=Utils.create_info_embed(
@@ -441,9 +660,21 @@ class RoleAssignment(commands.Cog):
             )
             return
 
+        # Every role edit would be rejected without Manage Roles, so fail before sorting roles
+        if not interaction.guild.me.guild_permissions.manage_roles:
+            await Utils.send_response(
+                interaction,
+                embed=self.error_embed(
+                    "I am missing the following permissions: Manage Roles",
+                    "Missing Bot Permissions"
+                ),
+                ephemeral=True
+            )
+            return
+
         # Get roles the user has
-        user_role_ids = [role.id for role in interaction.user.roles]
-        user_gooner_roles = [role for role in gooner_roles if role.id in user_role_ids]
+        user_role_ids = {role.id for role in interaction.user.roles}
+        user_gooner_roles = [(role, mention) for role, _, mention in gooner_entries if role.id in user_role_ids]
         
         if not user_gooner_roles:
             await Utils.send_response(
@@ -460,15 +691,20 @@ class RoleAssignment(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            # Remove all Gooner roles from the user
-            await interaction.user.remove_roles(*user_gooner_roles, reason=f"Self-removed all Gooner roles")
+            # Remove all Gooner roles from the user with a single member edit
+            removed_ids = {role.id for role, _ in user_gooner_roles}
+            await self.edit_member_roles(
+                interaction,
+                lambda roles: [r for r in roles if r.id not in removed_ids],
+                "Self-removed all Gooner roles"
+            )
             
             embed = Utils.create_success_embed(
                 f"Successfully left {len(user_gooner_roles)} Gooner role(s)!",
                 "All Roles Removed"
             )
             
-            role_list = "\n".join([f"• {role.mention}" for role in user_gooner_roles])
+            role_list = "\n".join(f"• {mention}" for _, mention in user_gooner_roles)
             embed.add_field(
                 name="👋 Roles Removed",
                 value=role_list,
@@ -484,13 +720,13 @@ class RoleAssignment(commands.Cog):
             await Utils.send_response(interaction, embed=embed, ephemeral=True)
             
             # Log the action
-            role_names = [role.name for role in user_gooner_roles]
-            self.bot.logger.info(f"User {interaction.user} self-removed all Gooner roles ({', '.join(role_names)}) in {interaction.guild.name}")
+            role_names = ", ".join(role.name for role, _ in user_gooner_roles)
+            self.log_action("User %s self-removed all Gooner roles (%s) in %s", interaction.user, role_names, interaction.guild.name)
 
         except discord.Forbidden:
             await Utils.send_response(
                 interaction,
-                embed=Utils.create_error_embed("I don't have permission to remove some or all of these roles."),
+                embed=self.error_embed("I don't have permission to remove some or all of these roles."),
                 ephemeral=True
             )
         except discord.HTTPException as e:
@@ -500,58 +736,175 @@ class RoleAssignment(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(name="sync_roles", description="Set your Gooner roles to all or none in one step")
+    @app_commands.describe(target="Whether you should end up with all Gooner roles or none")
+    @app_commands.choices(target=[
+        app_commands.Choice(name="All", value="all"),
+        app_commands.Choice(name="None", value="none"),
+    ])
+    async def sync_roles(self, interaction: discord.Interaction, target: str):
+        """Bring the user's Gooner roles to all or none with a single member edit"""
+        gooner_entries = self.get_gooner_entries(interaction.guild)
+        
+        if not gooner_entries:
+            await Utils.send_response(
+                interaction,
+                embed=Utils.create_info_embed(
+                    "No Gooner roles are currently available.",
+                    "No Roles Available"
+                ),
+                ephemeral=True
+            )
+            return
+
+        # Every role edit would be rejected without Manage Roles, so fail before sorting roles
+        if not interaction.guild.me.guild_permissions.manage_roles:
+            await Utils.send_response(
+                interaction,
+                embed=self.error_embed(
+                    "I am missing the following permissions: Manage Roles",
+                    "Missing Bot Permissions"
+                ),
+                ephemeral=True
+            )
+            return
+
+        # Diff the user's Gooner roles against the target in one pass
+        want = target == "all"
+        user_role_ids = {role.id for role in interaction.user.roles}
+        top_pos = interaction.guild.me.top_role.position
+        added_roles, removed_roles, skipped_roles = [], [], []
+        
+        for role, _, mention in gooner_entries:
+            if (role.id in user_role_ids) == want:
+                continue
+            if role.managed or role.position >= top_pos:
+                skipped_roles.append(mention)
+            else:
+                (added_roles if want else removed_roles).append((role, mention))
+
+        if not added_roles and not removed_roles:
+            if skipped_roles:
+                embed = self.error_embed(
+                    "None of the Gooner roles that need changing can be managed by the bot.",
+                    "No Manageable Roles"
+                )
+            else:
+                embed = Utils.create_info_embed(
+                    "Your Gooner roles already match.",
+                    "Nothing to Sync"
+                )
+            await Utils.send_response(interaction, embed=embed, ephemeral=True)
+            return
+
+        # Defer the response as changing multiple roles might take time
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            # Apply the whole diff with a single member edit
+            changed_ids = {role.id for role, _ in added_roles + removed_roles}
+            await self.edit_member_roles(
+                interaction,
+                lambda roles: [*(r for r in roles if r.id not in changed_ids), *(role for role, _ in added_roles)],
+                "Synced Gooner roles"
+            )
+            
+            embed = Utils.create_success_embed(
+                f"Added {len(added_roles)} and removed {len(removed_roles)} Gooner role(s).",
+                "Roles Synced"
+            )
+            
+            if added_roles:
+                embed.add_field(
+                    name="🎉 Roles Added",
+                    value="\n".join(f"• {mention}" for _, mention in added_roles),
+                    inline=False
+                )
+            
+            if removed_roles:
+                embed.add_field(
+                    name="👋 Roles Removed",
+                    value="\n".join(f"• {mention}" for _, mention in removed_roles),
+                    inline=False
+                )
+            
+            if skipped_roles:
+                embed.add_field(
+                    name="⚠️ Roles Not Changed",
+                    value="The following roles could not be changed:\n" + "\n".join(f"• {mention}" for mention in skipped_roles),
+                    inline=False
+                )
+            
+            await Utils.send_response(interaction, embed=embed, ephemeral=True)
+            
+            # Log the action
+            self.log_action(
+                "User %s synced Gooner roles to %s (+%d, -%d) in %s",
+                interaction.user, target, len(added_roles), len(removed_roles), interaction.guild.name
+            )
+
+        except discord.Forbidden:
+            await Utils.send_response(
+                interaction,
+                embed=self.error_embed("I don't have permission to change some or all of these roles."),
+                ephemeral=True
+            )
+        except discord.HTTPException as e:
+            await Utils.send_response(
+                interaction,
+                embed=Utils.create_error_embed(f"Failed to sync roles: {str(e)}"),
+                ephemeral=True
+            )
+
+    def build_role_choices(self, guild: discord.Guild, current: str, keep=None) -> List[app_commands.Choice[str]]:
+        """Build autocomplete choices for Gooner roles matching the current input"""
+        needle = current.lower()
+        entries = self.get_gooner_entries(guild)
+
+        # Share matches between keystroke bursts from users typing the same input
+        cache_key = (guild.id, needle)
+        cached = self.role_match_cache.get(cache_key)
+        if cached and cached[1] is entries and time.monotonic() - cached[0] < 1:
+            self.role_match_cache.move_to_end(cache_key)
+            matches = cached[2]
+        else:
+            # An empty input matches every role, so skip the substring scan
+            matches = [role for role, lowered, _ in entries if not needle or needle in lowered]
+            self.role_match_cache[cache_key] = (time.monotonic(), entries, matches)
+            self.role_match_cache.move_to_end(cache_key)
+            if len(self.role_match_cache) > 1024:
+                self.role_match_cache.popitem(last=False)
+
+        choices = []
+        for role in matches:
+            if keep and not keep(role):
+                continue
+            choices.append(app_commands.Choice(name=role.name, value=str(role.id)))
+            # Stop at 25 choices (Discord limit) instead of filtering every role
+            if len(choices) == 25:
+                break
+        return choices
+
     @join_role.autocomplete('role')
     async def join_role_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Autocomplete for join_role command - shows available Gooner roles"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
-        user_role_ids = [role.id for role in interaction.user.roles]
+        user_role_ids = {role.id for role in interaction.user.roles}
         
         # Only show roles the user doesn't have
-        available_roles = [role for role in gooner_roles if role.id not in user_role_ids]
-        
-        # Filter by current input
-        if current:
-            available_roles = [role for role in available_roles if current.lower() in role.name.lower()]
-        
-        # Return up to 25 choices (Discord limit)
-        return [
-            app_commands.Choice(name=role.name, value=str(role.id))
-            for role in available_roles[:25]
-        ]
+        return self.build_role_choices(interaction.guild, current, lambda role: role.id not in user_role_ids)
 
     @leave_role.autocomplete('role')
     async def leave_role_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Autocomplete for leave_role command - shows user's current Gooner roles"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
-        user_role_ids = [role.id for role in interaction.user.roles]
+        user_role_ids = {role.id for role in interaction.user.roles}
         
         # Only show roles the user has
-        user_gooner_roles = [role for role in gooner_roles if role.id in user_role_ids]
-        
-        # Filter by current input
-        if current:
-            user_gooner_roles = [role for role in user_gooner_roles if current.lower() in role.name.lower()]
-        
-        # Return up to 25 choices (Discord limit)
-        return [
-            app_commands.Choice(name=role.name, value=str(role.id))
-            for role in user_gooner_roles[:25]
-        ]
+        return self.build_role_choices(interaction.guild, current, lambda role: role.id in user_role_ids)
 
     @toggle_role.autocomplete('role')
     async def toggle_role_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Autocomplete for toggle_role command - shows all Gooner roles"""
-        gooner_roles = self.get_gooner_roles(interaction.guild)
-        
-        # Filter by current input
-        if current:
-            gooner_roles = [role for role in gooner_roles if current.lower() in role.name.lower()]
-        
-        # Return up to 25 choices (Discord limit)
-        return [
-            app_commands.Choice(name=role.name, value=str(role.id))
-            for role in gooner_roles[:25]
-        ]
+        return self.build_role_choices(interaction.guild, current)
 
 
 async def setup(bot):
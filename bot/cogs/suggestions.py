@@ -7,6 +7,9 @@ import logging
 
 from bot.utils.utils import Utils, is_superuser
 
+# Activity totals for users with no rows in the tracked window
+NO_ACTIVITY = {"message_count": 0, "voice_minutes": 0}
+
 
 class BotSuggestions(commands.Cog):
     """Bot suggestions based on user activity and moderation history"""
@@ -81,7 +84,10 @@ class BotSuggestions(commands.Cog):
         """Calculate activity score for a user"""
         # Get activity data from database
         activity_data = await self.bot.database.get_user_activity(guild_id, user_id, days)
-        
+        return self.score_activity(activity_data, days)
+
+    def score_activity(self, activity_data: dict, days: int = 30) -> dict:
+        """Score already-fetched activity totals for a user"""
         message_count = activity_data["message_count"]
         voice_minutes = activity_data["voice_minutes"]
         
@@ -114,6 +120,10 @@ class BotSuggestions(commands.Cog):
             if case["user_id"] == user_id:
                 cases.append(case)
         
+        return self.summarize_moderation(warning_count, cases)
+
+    def summarize_moderation(self, warning_count: int, cases: list) -> dict:
+        """Summarize a user's already-fetched warnings count and active cases"""
         # Count different types of punishments
         bans = sum(1 for case in cases if case["case_type"] == "ban")
         kicks = sum(1 for case in cases if case["case_type"] == "kick")
@@ -162,6 +172,13 @@ class BotSuggestions(commands.Cog):
             guild = interaction.guild
             suggestions = []
             
+            # Fetch activity, warnings and cases for the whole guild once instead of per member
+            activity_by_user = await self.bot.database.get_all_user_activity(guild.id)
+            warning_counts = await self.bot.database.get_all_warning_counts(guild.id)
+            cases_by_user = defaultdict(list)
+            for case in await self.bot.database.get_active_cases(guild.id):
+                cases_by_user[case["user_id"]].append(case)
+            
             for member in guild.members:
                 # Skip bots
                 if member.bot:
@@ -172,14 +189,14 @@ class BotSuggestions(commands.Cog):
                     continue
                 
                 # Calculate activity score
-                activity_data = await self.calculate_activity_score(guild.id, member.id)
+                activity_data = self.score_activity(activity_by_user.get(member.id, NO_ACTIVITY))
                 
                 # Skip if activity is too low
                 if activity_data["total_score"] < min_activity:
                     continue
                 
                 # Get moderation stats
-                mod_stats = await self.get_user_moderation_stats(guild.id, member.id)
+                mod_stats = self.summarize_moderation(warning_counts.get(member.id, 0), cases_by_user[member.id])
                 
                 # Skip if too many warnings
                 if mod_stats["warning_count"] > max_warnings:
@@ -473,6 +490,9 @@ class BotSuggestions(commands.Cog):
             guild = interaction.guild
             leaderboard = []
             
+            # Fetch activity for the whole guild once instead of per member
+            activity_by_user = await self.bot.database.get_all_user_activity(guild.id)
+            
             for member in guild.members:
                 # Skip bots
                 if member.bot:
@@ -483,7 +503,7 @@ class BotSuggestions(commands.Cog):
                     continue
                 
                 # Calculate activity score
-                activity_data = await self.calculate_activity_score(guild.id, member.id)
+                activity_data = self.score_activity(activity_by_user.get(member.id, NO_ACTIVITY))
                 
                 # Skip users with no activity
                 if activity_data["total_score"] == 0:
@@ -1,16 +1,33 @@
 import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import aiosqlite
 
+# Number of read-only connections kept open for concurrent lookups
+READ_POOL_SIZE = 4
+
+# Frequently used case queries, kept as constants so SQLite's statement cache hits reliably
+USER_CASES_QUERY = """SELECT *, CAST(strftime('%s', created_at) AS INTEGER) AS created_ts
+               FROM moderation_cases
+               WHERE guild_id = ? AND user_id = ?
+               ORDER BY created_at DESC"""
+
+RECENT_CASES_QUERY = """SELECT *, CAST(strftime('%s', created_at) AS INTEGER) AS created_ts
+               FROM moderation_cases
+               WHERE guild_id = ?
+               ORDER BY created_at DESC
+               LIMIT ?"""
+
 
 class Database:
     def __init__(self):
         self.db_path = Path("data/bot.db")
         self.connection = None
+        self.read_pool = None
         self.logger = logging.getLogger(__name__)
 
     async def initialize(self):
@@ -131,7 +148,18 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_moderation_cases_guild_user 
             ON moderation_cases(guild_id, user_id)
         """)
-        
+
+        # Composite indexes so case lookups ordered by date can skip the sort
+        await self.connection.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mod_cases_guild_user_created
+            ON moderation_cases(guild_id, user_id, created_at DESC)
+        """)
+
+        await self.connection.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mod_cases_guild_created
+            ON moderation_cases(guild_id, created_at DESC)
+        """)
+
         await self.connection.execute("""
             CREATE INDEX IF NOT EXISTS idx_warnings_guild_user 
             ON warnings(guild_id, user_id)
@@ -238,12 +266,36 @@ class Database:
         
         self.connection = await aiosqlite.connect(self.db_path)
         await self.connection.execute("PRAGMA foreign_keys = ON")
+        # WAL lets the read pool query while the main connection writes
+        await self.connection.execute("PRAGMA journal_mode = WAL")
+        await self.connection.execute("PRAGMA synchronous = NORMAL")
+        await self.connection.execute("PRAGMA cache_size = -20000")
         # Enable row factory for dictionary-like access
         self.connection.row_factory = aiosqlite.Row
         await self.create_tables()
         await self.migrate_database()  # Add migration after table creation
+        await self.open_read_pool()
         self.logger.info("Database initialized successfully")
 
+    async def open_read_pool(self):
+        """Open the pool of read-only connections"""
+        self.read_pool = asyncio.Queue()
+        for _ in range(READ_POOL_SIZE):
+            connection = await aiosqlite.connect(self.db_path)
+            connection.row_factory = aiosqlite.Row
+            await connection.execute("PRAGMA query_only = ON")
+            await connection.execute("PRAGMA cache_size = -20000")
+            self.read_pool.put_nowait(connection)
+
+    @asynccontextmanager
+    async def read_connection(self):
+        """Borrow a read-only connection from the pool"""
+        connection = await self.read_pool.get()
+        try:
+            yield connection
+        finally:
+            self.read_pool.put_nowait(connection)
+
     # Guild configuration methods
     async def get_guild_config(self, guild_id: int) -> dict:
         """Get guild configuration"""
@@ -264,6 +316,15 @@ class Database:
         await self.connection.commit()
         return await self.get_guild_config(guild_id)
 
+    async def create_guild_configs(self, guild_ids: list) -> int:
+        """Create default guild configurations for many guilds in one statement"""
+        cursor = await self.connection.executemany(
+            "INSERT OR IGNORE INTO guild_config (guild_id) VALUES (?)",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        await self.connection.commit()
+        return cursor.rowcount
+
     async def update_guild_config(self, guild_id: int, **kwargs) -> bool:
         """Update guild configuration"""
         if not kwargs:
@@ -308,14 +369,16 @@ class Database:
 
     async def get_user_cases(self, guild_id: int, user_id: int) -> list:
         """Get all moderation cases for a user"""
-        async with self.connection.execute(
-            """SELECT * FROM moderation_cases 
-               WHERE guild_id = ? AND user_id = ? 
-               ORDER BY created_at DESC""",
-            (guild_id, user_id)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
+        async with self.read_connection() as connection:
+            async with connection.execute(USER_CASES_QUERY, (guild_id, user_id)) as cursor:
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+
+    async def get_recent_cases(self, guild_id: int, limit: int = 10) -> list:
+        """Get the most recent moderation cases for a guild"""
+        async with self.read_connection() as connection:
+            async with connection.execute(RECENT_CASES_QUERY, (guild_id, limit)) as cursor:
+                return await cursor.fetchall()
 
     async def get_active_cases(self, guild_id: int) -> list:
         """Get all active moderation cases for a guild"""
@@ -371,6 +434,18 @@ class Database:
             row = await cursor.fetchone()
             return row[0] if row else 0
 
+    async def get_all_warning_counts(self, guild_id: int) -> dict:
+        """Get the number of active warnings for every warned user in a guild, keyed by user ID"""
+        async with self.read_connection() as connection:
+            async with connection.execute(
+                """SELECT user_id, COUNT(*) FROM warnings 
+                   WHERE guild_id = ? AND active = 1
+                   GROUP BY user_id""",
+                (guild_id,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return {row[0]: row[1] for row in rows}
+
     async def remove_warning(self, warning_id: int) -> bool:
         """Remove a specific warning"""
         await self.connection.execute(
@@ -539,6 +614,28 @@ class Database:
                 }
             return {"message_count": 0, "voice_minutes": 0}
 
+    async def get_all_user_activity(self, guild_id: int, days: int = 30) -> dict:
+        """Get activity for the last N days for every user in a guild, keyed by user ID"""
+        from datetime import date, timedelta
+        cutoff_date = date.today() - timedelta(days=days)
+        
+        async with self.read_connection() as connection:
+            async with connection.execute(
+                """SELECT user_id, SUM(message_count) as total_messages, SUM(voice_minutes) as total_voice_minutes
+                   FROM user_activity 
+                   WHERE guild_id = ? AND date >= ?
+                   GROUP BY user_id""",
+                (guild_id, cutoff_date)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return {
+                    row["user_id"]: {
+                        "message_count": row["total_messages"] or 0,
+                        "voice_minutes": row["total_voice_minutes"] or 0
+                    }
+                    for row in rows
+                }
+
     async def get_top_active_users(self, guild_id: int, days: int = 30, limit: int = 50) -> list:
         """Get top active users in a guild"""
         from datetime import date, timedelta
@@ -570,6 +667,9 @@ class Database:
 
     async def close(self):
         """Close the database connection"""
+        if self.read_pool:
+            while not self.read_pool.empty():
+                await self.read_pool.get_nowait().close()
         if self.connection:
             await self.connection.close()
             self.logger.info("Database connection closed")
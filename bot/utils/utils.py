@@ -59,8 +59,11 @@ class Utils:
         return datetime.now(timezone.utc)
     
     @staticmethod
-    def format_timestamp(dt: datetime, style: str = "F") -> str:
-        """Format a datetime object as a Discord timestamp"""
+    def format_timestamp(dt: Union[datetime, int], style: str = "F") -> str:
+        """Format a datetime object or unix timestamp as a Discord timestamp"""
+        # Unix timestamps can be used as-is
+        if isinstance(dt, int):
+            return f"<t:{dt}:{style}>"
         # Handle both timezone-aware and naive datetimes
         if dt.tzinfo is None:
             # Assume UTC if no timezone info
@@ -186,6 +189,57 @@ class Utils:
         
         return True
     
+    @staticmethod
+    async def check_permission_mask(
+        interaction: discord.Interaction,
+        mask: int
+    ) -> bool:
+        """Check if user has every permission in a precomputed permission bitmask"""
+        user_perms = interaction.user.guild_permissions
+        if user_perms.administrator or (user_perms.value & mask) == mask:
+            return True
+
+        embed = Utils.create_error_embed(
+            f"You are missing the following permissions: {Utils.format_permissions(mask & ~user_perms.value)}",
+            "Missing Permissions"
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return False
+
+    @staticmethod
+    async def check_all_permissions(
+        interaction: discord.Interaction,
+        user_mask: int,
+        bot_mask: int
+    ) -> bool:
+        """Check user and bot permission bitmasks together and report everything missing at once"""
+        user_perms = interaction.user.guild_permissions
+        bot_perms = interaction.guild.me.guild_permissions
+        problems = []
+        user_missing = not user_perms.administrator and (user_perms.value & user_mask) != user_mask
+        if user_missing:
+            problems.append(
+                f"You are missing the following permissions: {Utils.format_permissions(user_mask & ~user_perms.value)}"
+            )
+        if (bot_perms.value & bot_mask) != bot_mask:
+            problems.append(
+                f"I am missing the following permissions: {Utils.format_permissions(bot_mask & ~bot_perms.value)}"
+            )
+
+        if problems:
+            # Keep the existing bot-side title when only the bot is missing permissions
+            title = "Missing Permissions" if user_missing else "Missing Bot Permissions"
+            embed = Utils.create_error_embed("\n".join(problems), title)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return False
+
+        return True
+
+    @staticmethod
+    def format_permissions(mask: int) -> str:
+        """Format the permissions set in a bitmask as a readable list"""
+        return ", ".join(perm.replace("_", " ").title() for perm, value in discord.Permissions(mask) if value)
+
     @staticmethod
     async def check_bot_permissions(
         interaction: discord.Interaction,
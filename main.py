@@ -97,12 +97,11 @@ class BonkBot(commands.Bot):
         """Initialize guild configs for all guilds the bot is already in"""
         self.logger.info("Initializing guild configurations for existing guilds...")
         
-        for guild in self.guilds:
-            try:
-                await self.database.create_guild_config(guild.id)
-                self.logger.debug(f"Initialized guild config for {guild.name} (ID: {guild.id})")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize guild config for {guild.name} (ID: {guild.id}): {e}")
+        try:
+            # Insert all missing configs with one statement and a single commit
+            await self.database.create_guild_configs([guild.id for guild in self.guilds])
+        except Exception as e:
+            self.logger.error(f"Failed to initialize guild configs: {e}")
         
         self.logger.info(f"Guild configuration initialization complete for {len(self.guilds)} guilds")
 